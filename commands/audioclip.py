@@ -1,34 +1,93 @@
 import asyncio
 from pathlib import Path
 from typing import Optional
-from discord import app_commands, File, Interaction
-from utils.audioclip import validate_youtube_url, parse_ts, download_clip_mp3
+from discord import app_commands, File, Interaction, FFmpegOpusAudio
+from utils.audioclip import (
+    validate_youtube_url,
+    parse_ts,
+    download_clip_mp3,
+    resolve_stream_clip,
+    build_stream_options,
+)
+from utils.monitor import defer_response
+from utils.voice import play_in_voice
 
 DOWNLOAD_DIR = Path("downloads")
 active_downloads: set[int] = set()
 
+async def play_clip(
+    interaction: Interaction,
+    canonical_url: str,
+    start_time: int,
+    clip_sec: Optional[int]
+):
+    """Stream a clip straight from the media URL into the user's voice channel."""
+
+    # Check user's voice state
+    user = interaction.user
+    if not user.voice or not user.voice.channel:
+        return await interaction.followup.send(
+            "❌ You must be in a voice channel.", ephemeral=True
+        )
+
+    # Resolve the direct media URL in a separate thread
+    try:
+        stream_url, start_time, clip_sec, title = await asyncio.to_thread(
+            resolve_stream_clip,
+            canonical_url,
+            start_time,
+            clip_sec
+        )
+    except Exception as e:
+        return await interaction.followup.send(
+            f"❌ Playback failed: {str(e)}",
+            ephemeral=True
+        )
+
+    # Play the clip: a single ffmpeg process reads the range and encodes to Opus
+    before_options, options = build_stream_options(start_time, clip_sec)
+
+    def make_source():
+        return FFmpegOpusAudio(stream_url, before_options=before_options, options=options)
+
+    await play_in_voice(interaction, user.voice.channel, make_source, title)
+
 def setup_audioclip(tree: app_commands.CommandTree):
     @tree.command(
         name="audioclip",
-        description="Turns a YouTube share link into an mp3 audio clip (up to 5 minutes)."
+        description="Turns a YouTube share link into an mp3 clip or plays it in voice (up to 5 minutes)."
     )
     @app_commands.describe(
         url="YouTube Share URL",
         length="Clip length (SS, MM:SS, or HH:MM:SS). Max 5m.",
-        file_name="Optional custom file name"
+        file_name="Optional custom file name (Download mode only)",
+        mode="Download the clip as an mp3 or play it in your voice channel"
     )
+    @app_commands.choices(mode=[
+        app_commands.Choice(name="Download", value="download"),
+        app_commands.Choice(name="Play", value="play"),
+    ])
     async def audioclip(
-        interaction: Interaction, 
-        url: str, 
-        length: Optional[str] = None, 
-        file_name: Optional[str] = None
+        interaction: Interaction,
+        url: str,
+        length: Optional[str] = None,
+        file_name: Optional[str] = None,
+        mode: Optional[app_commands.Choice[str]] = None
     ):
         user_id = interaction.user.id
 
         # One-at-a-time per user
         if user_id in active_downloads:
             return await interaction.response.send_message(
-                "⚠️ You already have a download in progress.", 
+                "⚠️ You already have a download or playback in progress.",
+                ephemeral=True
+            )
+
+        # File names only apply to downloads
+        play_mode = mode is not None and mode.value == "play"
+        if play_mode and file_name:
+            return await interaction.response.send_message(
+                "❌ `file_name` can't be used with Play mode.",
                 ephemeral=True
             )
 
@@ -37,7 +96,7 @@ def setup_audioclip(tree: app_commands.CommandTree):
             video_id, start_time = validate_youtube_url(url)
         except ValueError as ve:
             return await interaction.response.send_message(
-                f"❌ Invalid URL: {ve}", 
+                f"❌ Invalid URL: {ve}",
                 ephemeral=True
             )
 
@@ -46,7 +105,7 @@ def setup_audioclip(tree: app_commands.CommandTree):
             clip_sec = parse_ts(length)
         except ValueError as ve:
             return await interaction.response.send_message(
-                f"❌ Invalid time format: {ve}", 
+                f"❌ Invalid time format: {ve}",
                 ephemeral=True
             )
 
@@ -54,29 +113,36 @@ def setup_audioclip(tree: app_commands.CommandTree):
         canonical_url = f"https://www.youtube.com/watch?v={video_id}"
 
         # Defer response and add to active downloads
-        await interaction.response.defer(ephemeral=True)
+        await defer_response(interaction, ephemeral=True)
         active_downloads.add(user_id)
 
+        # Play mode: stream into voice without touching disk
+        if play_mode:
+            try:
+                return await play_clip(interaction, canonical_url, start_time, clip_sec)
+            finally:
+                active_downloads.discard(user_id)
+
         try:
             # Download the clip in a separate thread
             mp3_path = await asyncio.to_thread(
-                download_clip_mp3, 
-                canonical_url, 
-                DOWNLOAD_DIR, 
-                start_time, 
-                clip_sec, 
+                download_clip_mp3,
+                canonical_url,
+                DOWNLOAD_DIR,
+                start_time,
+                clip_sec,
                 file_name
             )
 
             # Send the file to the user
             await interaction.followup.send(
-                file=File(str(mp3_path)), 
+                file=File(str(mp3_path)),
                 ephemeral=True
             )
 
         except Exception as e:
             await interaction.followup.send(
-                f"❌ Download failed: {str(e)}", 
+                f"❌ Download failed: {str(e)}",
                 ephemeral=True
             )
         finally:
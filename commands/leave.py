@@ -1,11 +1,12 @@
 from discord import Interaction, app_commands
+from utils.monitor import defer_response
 
 def setup_leave(tree: app_commands.CommandTree):
     @tree.command(name="leave", description="Kick the bot from your voice channel.")
 
     async def leave(interaction: Interaction):
         # Defer response to handle potential delays
-        await interaction.response.defer(ephemeral=True)
+        await defer_response(interaction, ephemeral=True)
         
         user = interaction.user
         
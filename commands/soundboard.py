@@ -1,8 +1,22 @@
 import asyncio
+from datetime import datetime
 from typing import List
 from discord import Interaction, app_commands, FFmpegPCMAudio
 import discord
-from utils.soundboard import add_sound, delete_sound, load_sounds, list_sounds
+from utils.soundboard import (
+    add_sound,
+    delete_sound,
+    load_sounds,
+    list_sounds,
+    get_cached_frames,
+    cache_sound_frames,
+    CachedOpusAudio,
+    audio_cache_stats,
+    dedupe_sounds,
+)
+from utils.stats import record_play, top_sounds
+from utils.monitor import defer_response, monitor_stats
+from utils.voice import play_in_voice
 from pathlib import Path
 
 def setup_soundboard(tree: app_commands.CommandTree):
@@ -25,7 +39,7 @@ def setup_soundboard(tree: app_commands.CommandTree):
     @tree.command(name="soundboard", description="Play a sound in your voice channel.")
     @app_commands.describe(sound_name="Select a sound to play")
     async def soundboard(interaction: Interaction, sound_name: str):
-        await interaction.response.defer(ephemeral=True)
+        await defer_response(interaction, ephemeral=True)
         
         # Load sound data
         data, base_dir = load_sounds()
@@ -60,47 +74,21 @@ def setup_soundboard(tree: app_commands.CommandTree):
                 "❌ You must be in a voice channel.", ephemeral=True
             )
         
-        channel = user.voice.channel
-        vc = interaction.guild.voice_client
-
-        # Connect to voice channel
-        try:
-            if vc and vc.is_connected():
-                await vc.move_to(channel)
-            else:
-                vc = await channel.connect(timeout=10.0, reconnect=True)
-        except Exception as e:
-            return await interaction.followup.send(f"❌ Failed to join voice channel: {e}", ephemeral=True)
+        # Serve hot sounds from decoded frames, fall back to ffmpeg
+        frames = get_cached_frames(file_path)
         
-        # Play the sound
-        try:
-            source = FFmpegPCMAudio(str(file_path))
-            
-            done = asyncio.Event()
-            
-            def after_playing(error: Exception = None):
-                if error:
-                    print(f"Error playing sound: {error}")
-                interaction.client.loop.call_soon_threadsafe(done.set)
-            
-            vc.play(source, after=after_playing)
-            await interaction.followup.send(f"▶️ Playing **{sound_name}**.", ephemeral=True)
-            
-            # Wait for playback to finish
-            await done.wait()
-            
-            # Disconnect after playback
-            if vc and vc.is_connected():
-                await vc.disconnect()
-                
-        except Exception as e:
-            # Ensure cleanup on error
-            try:
-                if vc and vc.is_connected():
-                    await vc.disconnect()
-            except Exception:
-                pass
-            await interaction.followup.send(f"❌ Could not play sound: {e}", ephemeral=True)
+        def make_source():
+            if frames is not None:
+                return CachedOpusAudio(frames)
+            return FFmpegPCMAudio(str(file_path))
+        
+        if not await play_in_voice(interaction, user.voice.channel, make_source, sound_name):
+            return
+        record_play(sound_entry["id"])
+        
+        # Decode a missed sound so its next play skips ffmpeg
+        if frames is None:
+            await asyncio.to_thread(cache_sound_frames, file_path)
     
     # Autocomplete for soundboard
     @soundboard.autocomplete("sound_name")
@@ -118,12 +106,12 @@ def setup_soundboard(tree: app_commands.CommandTree):
         display_name: str,
         file: discord.Attachment,
     ):
-        await interaction.response.defer(ephemeral=True)
+        await defer_response(interaction, ephemeral=True)
         
         try:
-            await add_sound(display_name.strip(), file)
+            file_name = await add_sound(display_name.strip(), file)
             await interaction.followup.send(
-                f"✅ Added **{display_name}** → `{file.filename}`", 
+                f"✅ Added **{display_name}** → `{file_name}`", 
                 ephemeral=True
             )
         except Exception as e:
@@ -136,9 +124,9 @@ def setup_soundboard(tree: app_commands.CommandTree):
     @tree.command(name="soundboard_delete", description="Delete a sound entry from the soundboard.")
     @app_commands.describe(sound_name="The sound to delete")
     async def delete_sound_cmd(interaction: Interaction, sound_name: str):
-        await interaction.response.defer(ephemeral=True)
+        await defer_response(interaction, ephemeral=True)
         
-        if delete_sound(sound_name):
+        if await asyncio.to_thread(delete_sound, sound_name):
             await interaction.followup.send(
                 f"🗑️ Deleted sound `{sound_name}`.", 
                 ephemeral=True
@@ -152,4 +140,59 @@ def setup_soundboard(tree: app_commands.CommandTree):
     # Autocomplete for delete command
     @delete_sound_cmd.autocomplete("sound_name")
     async def sound_id_autocomplete(_interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
-        return autocomplete_sound_name(current)
\ No newline at end of file
+        return autocomplete_sound_name(current)
+
+    # ======================
+    # Soundboard Stats Command
+    # ======================
+    
+    @tree.command(name="soundboard_stats", description="Show the most played sounds.")
+    async def stats_cmd(interaction: Interaction):
+        await defer_response(interaction, ephemeral=True)
+        
+        data, _ = load_sounds()
+        names = {str(sound["id"]): sound["display_name"] for sound in data.get("sounds", [])}
+        
+        lines = []
+        for sound_id, plays, last_played in top_sounds(10):
+            if sound_id not in names:
+                continue
+            when = datetime.fromtimestamp(last_played).strftime("%Y-%m-%d %H:%M")
+            lines.append(f"{len(lines) + 1}. **{names[sound_id]}** — {plays} plays (last {when})")
+        
+        cache = audio_cache_stats()
+        lines.append(
+            f"\nCache: {cache['hit_rate']:.0%} hit rate "
+            f"({cache['hits']} hits, {cache['misses']} misses), "
+            f"{cache['entries']} sounds / {cache['bytes'] / (1024 * 1024):.1f} MB"
+        )
+        
+        health = monitor_stats()
+        lines.append(
+            f"Loop: {health['stalls']} stalls (max {health['max_stall']:.2f}s), "
+            f"{health['slow_defers']} slow defers, "
+            f"{health['late_voice_frames']}/{health['voice_frames']} late voice frames"
+        )
+        
+        if len(lines) == 2:
+            lines.insert(0, "No sounds have been played yet.")
+        
+        await interaction.followup.send("\n".join(lines), ephemeral=True)
+
+    # ======================
+    # Soundboard Dedupe Command
+    # ======================
+    
+    @tree.command(name="soundboard_dedupe", description="Merge soundboard entries whose audio files are identical.")
+    @app_commands.default_permissions(manage_guild=True)
+    async def dedupe_cmd(interaction: Interaction):
+        await defer_response(interaction, ephemeral=True)
+        
+        try:
+            removed, freed = await asyncio.to_thread(dedupe_sounds)
+            await interaction.followup.send(
+                f"🧹 Removed {removed} duplicate files ({freed / (1024 * 1024):.1f} MB freed).",
+                ephemeral=True
+            )
+        except Exception as e:
+            await interaction.followup.send(f"❌ Dedupe failed: {e}", ephemeral=True)
\ No newline at end of file
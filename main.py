@@ -1,8 +1,12 @@
 import os
+import asyncio
 import discord
 from dotenv import load_dotenv
 from discord import Intents, app_commands, Object
 from commands import setup_all
+from utils.soundboard import warm_sound_cache
+from utils.stats import start_stats_flusher, stop_stats_flusher
+from utils.monitor import start_monitor, stop_monitor, interaction_received, interaction_completed
 
 load_dotenv()
 discord_token = os.getenv('DISCORD_TOKEN')
@@ -14,11 +18,26 @@ intents = Intents.default()
 intents.voice_states = True  
 intents.message_content = True
 
+class MonitoredCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Runs before the command callback, unlike the on_interaction event
+        interaction_received(interaction)
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        # Failed commands never reach on_app_command_completion
+        interaction_completed(interaction)
+        await super().on_error(interaction, error)
+
 client = discord.Client(intents=intents)
-tree = app_commands.CommandTree(client)
+tree = MonitoredCommandTree(client)
+warm_task = None
 
 @client.event
 async def setup_hook():
+    # Watch the event loop for stalls before anything else runs on it
+    start_monitor()
+
     tree.clear_commands(guild=GUILD)
 
     setup_all(tree)
@@ -26,8 +45,32 @@ async def setup_hook():
     tree.copy_global_to(guild=GUILD)
     await tree.sync(guild=GUILD)
 
+    # Persist play stats periodically
+    start_stats_flusher()
+
+    # Warm in the background so the gateway connection is not held up
+    global warm_task
+    warm_task = asyncio.create_task(warm_cache())
+
+async def warm_cache():
+    warmed = await asyncio.to_thread(warm_sound_cache)
+    print(f'Warmed {warmed} sounds into the cache')
+
+@client.event
+async def on_app_command_completion(interaction: discord.Interaction, _command):
+    interaction_completed(interaction)
+
 @client.event
 async def on_ready():
     print(f'We have logged in as {client.user}')
 
-client.run(discord_token)
\ No newline at end of file
+async def main():
+    async with client:
+        try:
+            await client.start(discord_token)
+        finally:
+            stop_monitor()
+            await stop_stats_flusher()
+
+discord.utils.setup_logging()
+asyncio.run(main())
\ No newline at end of file
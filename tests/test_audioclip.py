@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+
+pytest.importorskip("discord")
+pytest.importorskip("yt_dlp")
+from discord import app_commands
+from utils.audioclip import build_stream_options
+from commands.audioclip import setup_audioclip
+
+class FakeTree:
+    def __init__(self):
+        self.commands = {}
+
+    def command(self, name: str, description: str):
+        def decorator(func):
+            self.commands[name] = func
+            return func
+        return decorator
+
+class FakeResponse:
+    def __init__(self):
+        self.messages = []
+        self.deferred = False
+
+    async def send_message(self, content: str, ephemeral: bool = False):
+        self.messages.append(content)
+
+    async def defer(self, ephemeral: bool = False):
+        self.deferred = True
+
+class FakeUser:
+    id = 1
+
+class FakeInteraction:
+    def __init__(self):
+        self.user = FakeUser()
+        self.response = FakeResponse()
+
+def test_stream_options_seek_on_input_side():
+    before_options, options = build_stream_options(90, 15)
+
+    before = before_options.split()
+    assert before[before.index("-ss") + 1] == "90"
+    assert before[before.index("-t") + 1] == "15"
+    assert "-reconnect" in before
+    assert "-ss" not in options.split()
+    assert "-t" not in options.split()
+
+def test_play_mode_rejects_file_name():
+    tree = FakeTree()
+    setup_audioclip(tree)
+    interaction = FakeInteraction()
+
+    asyncio.run(tree.commands["audioclip"](
+        interaction,
+        url="https://youtu.be/dQw4w9WgXcQ",
+        file_name="clip",
+        mode=app_commands.Choice(name="Play", value="play"),
+    ))
+
+    assert not interaction.response.deferred
+    assert len(interaction.response.messages) == 1
+    assert "file_name" in interaction.response.messages[0]
@@ -0,0 +1,65 @@
+import importlib
+import pytest
+
+pytest.importorskip("discord")
+import utils.monitor
+
+class FakeSource:
+    def __init__(self, clock: list, durations: list):
+        self.clock = clock
+        self.durations = durations
+
+    def is_opus(self) -> bool:
+        return True
+
+    def read(self) -> bytes:
+        self.clock[0] += self.durations.pop(0) if self.durations else 0.0
+        return b"x"
+
+    def cleanup(self) -> None:
+        pass
+
+@pytest.fixture
+def monitor():
+    return importlib.reload(utils.monitor)
+
+def play(monitor, monkeypatch, calls: list, durations: list = ()) -> "utils.monitor.MonitoredSource":
+    """Read one frame at each player call time; durations is how long each read blocks."""
+    clock = [0.0]
+    monkeypatch.setattr(monitor.time, "perf_counter", lambda: clock[0])
+    source = monitor.MonitoredSource(FakeSource(clock, list(durations)))
+    for called_at in calls:
+        clock[0] = max(clock[0], called_at)
+        source.read()
+    return source
+
+def test_stall_counts_every_frame_behind_its_slot(monitor, monkeypatch):
+    # Frame 2 is 60ms late and the player catches up on frames 3 and 4
+    source = play(monitor, monkeypatch, [0.0, 0.02, 0.1, 0.1, 0.1, 0.1])
+    source.cleanup()
+
+    stats = monitor.monitor_stats()
+    assert stats["voice_frames"] == 6
+    assert stats["late_voice_frames"] == 3
+
+def test_slow_first_read_is_not_counted(monitor, monkeypatch):
+    # ffmpeg takes 0.5s to start; the player then catches up and paces normally
+    calls = [0.0] + [0.5] * 25 + [0.5 + 0.02 * n for n in range(1, 6)]
+    source = play(monitor, monkeypatch, calls, durations=[0.5])
+    source.cleanup()
+
+    assert monitor.monitor_stats()["late_voice_frames"] == 0
+
+def test_schedule_reset_after_reconnect_is_followed(monitor, monkeypatch):
+    # Frame 3 waits for a reconnect, then the player restarts its 20ms schedule
+    source = play(monitor, monkeypatch, [0.0, 0.02, 0.04, 1.0, 1.02, 1.04, 1.06])
+    source.cleanup()
+
+    assert monitor.monitor_stats()["late_voice_frames"] == 1
+
+def test_cleanup_reports_once(monitor, monkeypatch):
+    source = play(monitor, monkeypatch, [0.0, 0.02, 0.04])
+    source.cleanup()
+    source.cleanup()
+
+    assert monitor.monitor_stats()["voice_frames"] == 3
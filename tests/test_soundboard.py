@@ -0,0 +1,134 @@
+import asyncio
+import json
+import pytest
+
+pytest.importorskip("discord")
+import utils.soundboard as soundboard
+
+class FakeAttachment:
+    content_type = "audio/mpeg"
+
+    def __init__(self, filename: str, content: bytes):
+        self.filename = filename
+        self._content = content
+
+    async def read(self) -> bytes:
+        return self._content
+
+@pytest.fixture
+def base_dir(tmp_path, monkeypatch):
+    """Empty sounds directory with its own index."""
+    base_dir = tmp_path / "sounds"
+    base_dir.mkdir()
+    monkeypatch.setattr(soundboard, "SOUNDS_JSON", base_dir / "sounds.json")
+    monkeypatch.setattr(soundboard, "_cache_mtime", -1.0)
+    monkeypatch.setattr(soundboard, "forget_sound", lambda sound_id: None)
+    write_index(base_dir, [])
+    return base_dir
+
+def write_index(base_dir, sounds: list) -> None:
+    data = {"base_dir": str(base_dir), "sounds": sounds}
+    (base_dir / "sounds.json").write_text(json.dumps(data), encoding="utf-8")
+
+def stored_files(base_dir) -> list:
+    return sorted(p.name for p in base_dir.iterdir() if p.name != "sounds.json")
+
+def add(display_name: str, filename: str, content: bytes) -> str:
+    return asyncio.run(soundboard.add_sound(display_name, FakeAttachment(filename, content)))
+
+def test_duplicate_upload_reuses_stored_file(base_dir):
+    assert add("first", "a.mp3", b"same") == "a.mp3"
+    assert add("second", "b.mp3", b"same") == "a.mp3"
+    assert stored_files(base_dir) == ["a.mp3"]
+
+def test_duplicate_display_name_is_rejected(base_dir):
+    add("first", "a.mp3", b"one")
+    with pytest.raises(ValueError):
+        add("first", "b.mp3", b"two")
+    assert stored_files(base_dir) == ["a.mp3"]
+
+def test_delete_keeps_file_until_last_reference(base_dir):
+    add("first", "a.mp3", b"same")
+    add("second", "b.mp3", b"same")
+
+    assert soundboard.delete_sound("first")
+    assert stored_files(base_dir) == ["a.mp3"]
+
+    assert soundboard.delete_sound("second")
+    assert stored_files(base_dir) == []
+    assert soundboard.load_sounds()[0]["hashes"] == {}
+
+def test_existing_sounds_are_backfilled_into_index(base_dir):
+    (base_dir / "old.mp3").write_bytes(b"same")
+    write_index(base_dir, [{"id": 1, "display_name": "old", "file_name": "old.mp3"}])
+
+    assert add("new", "new.mp3", b"same") == "old.mp3"
+    assert stored_files(base_dir) == ["old.mp3"]
+
+def test_dedupe_merges_identical_files(base_dir):
+    for name, content in (("c.mp3", b"same"), ("d.mp3", b"same"), ("e.mp3", b"other")):
+        (base_dir / name).write_bytes(content)
+    (base_dir / "stray.mp3").write_bytes(b"same")
+    write_index(base_dir, [
+        {"id": 1, "display_name": "c", "file_name": "c.mp3"},
+        {"id": 2, "display_name": "d", "file_name": "d.mp3"},
+        {"id": 3, "display_name": "e", "file_name": "e.mp3"},
+    ])
+
+    assert soundboard.dedupe_sounds() == (1, len(b"same"))
+
+    # Files no entry references are left alone
+    assert stored_files(base_dir) == ["c.mp3", "e.mp3", "stray.mp3"]
+    data, _ = soundboard.load_sounds()
+    assert [sound["file_name"] for sound in data["sounds"]] == ["c.mp3", "c.mp3", "e.mp3"]
+    assert sorted(data["hashes"].values()) == ["c.mp3", "e.mp3"]
+
+class FakeOpusAudio:
+    started = 0
+
+    def __init__(self, path: str, frames: int):
+        FakeOpusAudio.started += 1
+        self._frames = frames
+
+    def read(self) -> bytes:
+        self._frames -= 1
+        return b"f" if self._frames >= 0 else b""
+
+    def cleanup(self) -> None:
+        pass
+
+def test_long_sounds_are_only_decoded_once(base_dir, monkeypatch):
+    frames = soundboard.AUDIO_CACHE_MAX_FRAMES + 1
+    monkeypatch.setattr(FakeOpusAudio, "started", 0)
+    monkeypatch.setattr(soundboard.discord, "FFmpegOpusAudio", lambda path: FakeOpusAudio(path, frames))
+    file_path = base_dir / "long.mp3"
+
+    assert soundboard.cache_sound_frames(file_path) is None
+    assert soundboard.cache_sound_frames(file_path) is None
+    assert FakeOpusAudio.started == 1
+
+    # Replacing the file allows another attempt
+    soundboard.evict_cached_sound(file_path)
+    soundboard.cache_sound_frames(file_path)
+    assert FakeOpusAudio.started == 2
+
+def test_dedupe_skips_files_replaced_while_hashing(base_dir, monkeypatch):
+    for name in ("c.mp3", "d.mp3"):
+        (base_dir / name).write_bytes(b"same")
+    write_index(base_dir, [
+        {"id": 1, "display_name": "c", "file_name": "c.mp3"},
+        {"id": 2, "display_name": "d", "file_name": "d.mp3"},
+    ])
+
+    # Simulate d.mp3 being replaced by a different upload after it was hashed
+    hash_files = soundboard._hash_files
+
+    def hash_then_replace(base_dir, file_names):
+        file_hashes = hash_files(base_dir, file_names)
+        (base_dir / "d.mp3").write_bytes(b"different content")
+        return file_hashes
+
+    monkeypatch.setattr(soundboard, "_hash_files", hash_then_replace)
+
+    assert soundboard.dedupe_sounds() == (0, 0)
+    assert stored_files(base_dir) == ["c.mp3", "d.mp3"]
@@ -0,0 +1,93 @@
+import asyncio
+import importlib
+import json
+import pytest
+import utils.stats
+
+@pytest.fixture
+def stats(tmp_path, monkeypatch):
+    """Fresh stats module writing to a temporary file."""
+    module = importlib.reload(utils.stats)
+    monkeypatch.setattr(module, "STATS_JSON", tmp_path / "stats.json")
+    return module
+
+def read_file(stats) -> dict:
+    return json.loads(stats.STATS_JSON.read_text(encoding="utf-8"))["sounds"]
+
+def test_plays_are_buffered_until_flush(stats):
+    stats.record_play(1)
+    stats.record_play(1)
+    stats.record_play(2)
+
+    assert not stats.STATS_JSON.exists()
+    assert stats.play_counts() == {"1": 2, "2": 1}
+
+    stats.flush_stats()
+    data = read_file(stats)
+    assert data["1"]["plays"] == 2
+    assert data["2"]["plays"] == 1
+
+def test_flush_merges_with_persisted_stats(stats):
+    stats.STATS_JSON.write_text(
+        json.dumps({"sounds": {"1": {"plays": 5, "last_played": 100.0}}}),
+        encoding="utf-8"
+    )
+    stats.record_play(1)
+
+    assert stats.play_counts() == {"1": 6}
+    stats.flush_stats()
+    data = read_file(stats)
+    assert data["1"]["plays"] == 6
+    assert data["1"]["last_played"] > 100.0
+
+def test_forget_sound_removes_persisted_and_pending(stats):
+    stats.record_play(1)
+    stats.record_play(2)
+    stats.flush_stats()
+
+    stats.record_play(1)
+    stats.forget_sound(1)
+    assert stats.play_counts() == {"2": 1}
+
+    stats.flush_stats()
+    assert set(read_file(stats)) == {"2"}
+
+def test_reused_id_starts_from_zero_after_forget(stats):
+    stats.record_play(1)
+    stats.flush_stats()
+
+    stats.forget_sound(1)
+    stats.record_play(1)
+    stats.flush_stats()
+    assert read_file(stats)["1"]["plays"] == 1
+
+def test_top_sounds_ranks_by_plays(stats):
+    for sound_id in (3, 1, 3, 2, 3, 1):
+        stats.record_play(sound_id)
+
+    assert [(key, plays) for key, plays, _ in stats.top_sounds(2)] == [("3", 3), ("1", 2)]
+
+def test_stop_flusher_flushes_pending_plays(stats):
+    async def run():
+        stats.start_stats_flusher(interval=3600)
+        stats.record_play(7)
+        await stats.stop_stats_flusher()
+
+    asyncio.run(run())
+    assert read_file(stats)["7"]["plays"] == 1
+
+def test_forget_before_first_load_drops_persisted_count(stats):
+    stats.STATS_JSON.write_text(
+        json.dumps({"sounds": {"1": {"plays": 50, "last_played": 100.0}}}),
+        encoding="utf-8"
+    )
+    stats.forget_sound(1)
+
+    assert stats.play_counts() == {}
+    assert stats.top_sounds() == []
+
+def test_play_counts_returns_a_copy(stats):
+    stats.record_play(1)
+    stats.play_counts()["1"] = 99
+
+    assert stats.play_counts() == {"1": 1}
@@ -32,6 +32,16 @@ YTDL_BASE = {
     "noplaylist": True,
 }
 
+YTDL_STREAM = {
+    "format": "bestaudio/best",
+    "quiet": True,
+    "skip_download": True,
+    "noplaylist": True,
+}
+
+# ffmpeg input options for reading a remote media URL
+FFMPEG_STREAM_BEFORE_OPTS = "-nostdin -reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
+
 def parse_start_time(raw: str) -> Optional[int]:
     """
     Parse a YouTube time string (e.g., '120s') into seconds.
@@ -264,4 +274,63 @@ def download_clip_mp3(
         return output_path
 
     except Exception as e:
-        raise RuntimeError(f"Failed to download clip: {str(e)}") from e
\ No newline at end of file
+        raise RuntimeError(f"Failed to download clip: {str(e)}") from e
+
+def resolve_stream_clip(
+    canonical: str,
+    start_time: int,
+    clip_length: Optional[int]
+) -> Tuple[str, int, int, str]:
+    """
+    Resolve a direct media URL for a YouTube clip without downloading it.
+    
+    Args:
+        canonical (str): Canonical YouTube URL
+        start_time (int): Start time in seconds
+        clip_length (Optional[int]): Clip length in seconds
+        
+    Returns:
+        Tuple[str, int, int, str]: Media URL, start time, clip length and title
+        
+    Raises:
+        RuntimeError: If the stream cannot be resolved
+        ValueError: If parameters are invalid
+    """
+    try:
+        with YoutubeDL(YTDL_STREAM) as ydl:
+            info = ydl.extract_info(canonical, download=False)
+
+        stream_url = info.get("url")
+        if not stream_url:
+            raise ValueError("No playable audio stream found.")
+
+        duration = int(info.get("duration") or 0)
+        if duration <= 0:
+            raise ValueError("Video duration is zero or invalid.")
+
+        # Validate and adjust clip parameters
+        clip_length = max(1, min(clip_length or MAX_CLIP_SECONDS, MAX_CLIP_SECONDS))
+        start_time, clip_length = validate_clip_parameters(duration, start_time, clip_length)
+
+        return stream_url, start_time, clip_length, info.get("title") or "clip"
+
+    except Exception as e:
+        raise RuntimeError(f"Failed to resolve stream: {str(e)}") from e
+
+def build_stream_options(start_time: int, clip_length: int) -> Tuple[str, str]:
+    """
+    Build ffmpeg options that cut a clip out of a remote stream.
+    
+    Seeking is done on the input side so ffmpeg only fetches the
+    requested range instead of the whole file.
+    
+    Args:
+        start_time (int): Start time in seconds
+        clip_length (int): Clip length in seconds
+        
+    Returns:
+        Tuple[str, str]: ffmpeg before_options and options
+    """
+    before_options = f"{FFMPEG_STREAM_BEFORE_OPTS} -ss {start_time} -t {clip_length}"
+    options = "-vn"
+    return before_options, options
@@ -0,0 +1,214 @@
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from typing import Dict, Optional, Tuple
+from discord import AudioSource, Interaction, InteractionType
+
+# Loop stalls longer than this are reported (seconds)
+SLOW_CALLBACK_THRESHOLD = 0.25
+
+# How often the heartbeat ticks and the watchdog checks it (seconds)
+HEARTBEAT_INTERVAL = 0.1
+
+# Commands slower than this from receipt to defer are reported (Discord allows 3s)
+SLOW_DEFER_THRESHOLD = 1.5
+
+# Voice frames are 20ms; reads this far past their slot are counted as late
+VOICE_FRAME_SECONDS = 0.02
+VOICE_LATE_TOLERANCE = 0.01
+
+# Forget in-flight interactions after their token expires
+INTERACTION_TTL = 15 * 60
+
+# Lock to ensure thread-safety
+_lock = threading.Lock()
+
+# Monitor state
+_loop_thread_id: Optional[int] = None
+_last_tick = 0.0
+_running = False
+_heartbeat_task: Optional[asyncio.Task] = None
+
+# In-flight interactions keyed by ID: (command name, received at)
+_inflight: Dict[int, Tuple[str, float]] = {}
+
+# Counters
+_stats = {
+    "stalls": 0,
+    "max_stall": 0.0,
+    "interactions": 0,
+    "slow_defers": 0,
+    "max_defer": 0.0,
+    "voice_frames": 0,
+    "late_voice_frames": 0,
+}
+
+def _command_name(interaction: Interaction) -> str:
+    data = interaction.data or {}
+    return data.get("name") or str(interaction.type)
+
+def _format_inflight(now: float) -> str:
+    with _lock:
+        names = [f"/{name} ({now - received:.2f}s)" for name, received in _inflight.values()]
+    return ", ".join(names) or "none"
+
+async def _heartbeat() -> None:
+    """Tick on the event loop so the watchdog can tell when it stops."""
+
+    global _last_tick
+
+    while _running:
+        _last_tick = time.monotonic()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+def _watchdog() -> None:
+    """Report the loop thread's stack whenever the heartbeat falls behind."""
+
+    reported_tick = None
+    while _running:
+        time.sleep(HEARTBEAT_INTERVAL)
+        now = time.monotonic()
+        tick = _last_tick
+        stall = now - tick - HEARTBEAT_INTERVAL
+
+        if reported_tick is not None and tick != reported_tick:
+            # The loop recovered; record the full length of the stall
+            total = tick - reported_tick - HEARTBEAT_INTERVAL
+            with _lock:
+                _stats["stalls"] += 1
+                _stats["max_stall"] = max(_stats["max_stall"], total)
+            print(f"[monitor] event loop recovered after {total:.2f}s")
+            reported_tick = None
+
+        if reported_tick is None and stall > SLOW_CALLBACK_THRESHOLD:
+            # Capture what the loop is running while it is still stuck
+            reported_tick = tick
+            frame = sys._current_frames().get(_loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "unavailable\n"
+            print(
+                f"[monitor] event loop blocked for {stall:.2f}s; "
+                f"in-flight commands: {_format_inflight(now)}\n{stack}",
+                end=""
+            )
+
+        # Drop interactions that never reported completion
+        with _lock:
+            for interaction_id in [i for i, (_, t) in _inflight.items() if now - t > INTERACTION_TTL]:
+                del _inflight[interaction_id]
+
+def start_monitor() -> None:
+    """Start monitoring the running event loop. Call from the loop thread."""
+
+    global _loop_thread_id, _last_tick, _running, _heartbeat_task
+
+    if _running:
+        return
+    _running = True
+    _loop_thread_id = threading.get_ident()
+    _last_tick = time.monotonic()
+    _heartbeat_task = asyncio.get_running_loop().create_task(_heartbeat())
+    threading.Thread(target=_watchdog, name="loop-monitor", daemon=True).start()
+
+def stop_monitor() -> None:
+    """Stop the heartbeat and watchdog."""
+
+    global _running, _heartbeat_task
+
+    _running = False
+    if _heartbeat_task is not None:
+        _heartbeat_task.cancel()
+        _heartbeat_task = None
+
+def interaction_received(interaction: Interaction) -> None:
+    """Record when a slash command reached the bot."""
+
+    # Autocomplete and component interactions never report completion
+    if interaction.type is not InteractionType.application_command:
+        return
+    with _lock:
+        _inflight[interaction.id] = (_command_name(interaction), time.monotonic())
+        _stats["interactions"] += 1
+
+def interaction_completed(interaction: Interaction) -> None:
+    """Stop tracking an interaction."""
+
+    with _lock:
+        _inflight.pop(interaction.id, None)
+
+async def defer_response(interaction: Interaction, **kwargs) -> None:
+    """Defer an interaction and record how long it waited since receipt."""
+
+    # Measured before the HTTP call so only time spent on the bot counts
+    now = time.monotonic()
+    with _lock:
+        entry = _inflight.get(interaction.id)
+    await interaction.response.defer(**kwargs)
+    if entry is None:
+        return
+
+    name, received = entry
+    elapsed = now - received
+    with _lock:
+        _stats["max_defer"] = max(_stats["max_defer"], elapsed)
+        if elapsed > SLOW_DEFER_THRESHOLD:
+            _stats["slow_defers"] += 1
+    if elapsed > SLOW_DEFER_THRESHOLD:
+        print(f"[monitor] /{name} deferred {elapsed:.2f}s after receipt")
+
+def monitor_stats() -> Dict[str, float]:
+    """Return a snapshot of the monitor counters."""
+
+    with _lock:
+        return dict(_stats)
+
+class MonitoredSource(AudioSource):
+    """Audio source wrapper that counts voice frames read later than their slot."""
+
+    def __init__(self, original: AudioSource):
+        self.original = original
+        self._first_read: Optional[float] = None
+        self._last_read = 0.0
+        self._behind = False
+        self._frames = 0
+        self._late = 0
+        self._reported = False
+
+    def is_opus(self) -> bool:
+        return self.original.is_opus()
+
+    def read(self) -> bytes:
+        data = self.original.read()
+        now = time.perf_counter()
+
+        if self._first_read is None:
+            # The first read waits on ffmpeg startup, so the schedule starts after it
+            self._first_read = now
+        elif now > self._first_read + VOICE_FRAME_SECONDS * self._frames + VOICE_LATE_TOLERANCE:
+            if self._behind and now - self._last_read >= VOICE_FRAME_SECONDS - VOICE_LATE_TOLERANCE:
+                # Paced reads while behind mean the player reset its schedule
+                # (after a reconnect or resume) instead of catching up
+                self._first_read = now - VOICE_FRAME_SECONDS * self._frames
+                self._behind = False
+            else:
+                self._late += 1
+                self._behind = True
+        else:
+            self._behind = False
+
+        self._last_read = now
+        self._frames += 1
+        return data
+
+    def cleanup(self) -> None:
+        self.original.cleanup()
+        # The player and __del__ both call cleanup; only report once
+        if self._reported:
+            return
+        self._reported = True
+        with _lock:
+            _stats["voice_frames"] += self._frames
+            _stats["late_voice_frames"] += self._late
+        if self._late:
+            print(f"[monitor] {self._late} of {self._frames} voice frames sent late")
@@ -1,9 +1,14 @@
 import re
+import asyncio
 import json
+import uuid
+import hashlib
 import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional, Set
 import discord
+from utils.stats import play_counts, forget_sound, top_sounds
 
 # Regular expression for validating sound IDs
 ID_RE = re.compile(r"^[a-zA-Z0-9 _'-]{1,64}$")
@@ -19,8 +24,75 @@ _cache: Dict[str, str] = {}
 _cache_mtime: float = -1.0
 _base_dir = Path("./sounds")
 
+# In-memory cache of hot sounds decoded to 20ms Opus frames, keyed by path (LRU order)
+AUDIO_CACHE_MAX_BYTES = 32 * 1024 * 1024
+AUDIO_CACHE_MAX_SECONDS = 30
+AUDIO_CACHE_MAX_FRAMES = AUDIO_CACHE_MAX_SECONDS * 50
+_audio_lock = threading.Lock()
+_audio_cache: "OrderedDict[str, List[bytes]]" = OrderedDict()
+_audio_cache_bytes = 0
+_audio_cache_hits = 0
+_audio_cache_misses = 0
+
+# Sounds too long to cache, so they are not decoded again on every play
+_uncacheable: Set[str] = set()
+
 allowed_content_types = {'audio/mpeg', 'audio/wav', 'audio/ogg', 'audio/flac', 'audio/aac'}
 
+def _hash_file(file_path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _hash_files(base_dir: Path, file_names: Set[str]) -> Dict[str, str]:
+    """Hash stored files by name, skipping any that cannot be read."""
+    
+    file_hashes = {}
+    for file_name in file_names:
+        try:
+            file_hashes[file_name] = _hash_file(base_dir / file_name)
+        except Exception as e:
+            print(f"Error hashing file {base_dir / file_name}: {e}")
+    return file_hashes
+
+def _file_signature(file_path: Path) -> Optional[Tuple[int, int]]:
+    """Return a file's size and modification time, or None if it is missing."""
+    
+    try:
+        st = file_path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+def _backfill_hash_index(data: dict, base_dir: Path) -> Dict[str, str]:
+    """Add stored files that predate the hash index. Caller must hold the lock."""
+    
+    hashes = data.setdefault("hashes", {})
+    indexed = set(hashes.values())
+    missing = {sound["file_name"] for sound in data.get("sounds", [])} - indexed
+    for file_name, content_hash in _hash_files(base_dir, missing).items():
+        hashes.setdefault(content_hash, file_name)
+    return hashes
+
+def _file_refs(sounds: List[dict], file_name: str) -> int:
+    """Count the sound entries that point at a stored file."""
+    
+    return sum(1 for sound in sounds if sound["file_name"] == file_name)
+
+def _unlink_stored_file(data: dict, base_dir: Path, file_name: str) -> None:
+    """Delete a stored file and drop it from the hash index and cache."""
+    
+    file_path = base_dir / file_name
+    file_path.unlink()
+    evict_cached_sound(file_path)
+    hashes = data.get("hashes", {})
+    for content_hash in [h for h, name in hashes.items() if name == file_name]:
+        del hashes[content_hash]
+
 def load_sounds() -> Tuple[Dict[str, List], Path]:
     """Load the sounds from the JSON file and update the cache."""
     
@@ -62,19 +134,11 @@ def save_index_atomic(data: dict) -> None:
     except Exception as e:
         print(f"Error saving file atomically: {e}")
 
-async def add_sound(
-    display_name: str,
-    file: discord.Attachment,
-) -> None:
-    """Add a new sound to the system."""
+def _store_upload(display_name: str, file_name: str, content: bytes) -> str:
+    """Index an uploaded sound, writing it only if its content is new."""
+    
+    content_hash = hashlib.sha256(content).hexdigest()
     
-    if not ID_RE.match(display_name):
-        raise ValueError("Display Name must be less than 64 characters.")
-    if not file:
-        raise ValueError("File is required.")
-    if file.content_type not in allowed_content_types:
-        raise ValueError("Only audio files are allowed (.mp3, .wav, etc.).")
-
     with _lock:
         data, base_dir = load_sounds()
         sounds = data.get("sounds", [])
@@ -83,23 +147,50 @@ async def add_sound(
         if any(sound["display_name"] == display_name for sound in sounds):
             raise ValueError(f"Display Name '{display_name}' already exists.")
         
-        # Check for duplicate file names
-        file_path = base_dir / file.filename
-        if file_path.exists():
-            raise ValueError(f"File '{file_path}' already exists.")
-        
-        # Save the file
-        await file.save(file_path)
+        # Reuse the stored file if the same content was uploaded before
+        hashes = _backfill_hash_index(data, base_dir)
+        stored_name = hashes.get(content_hash)
+        if not stored_name or not (base_dir / stored_name).exists():
+            # Check for duplicate file names
+            file_path = base_dir / file_name
+            if file_path.exists():
+                raise ValueError(f"File '{file_path}' already exists.")
+            tmp_path = base_dir / f".{uuid.uuid4().hex}.part"
+            try:
+                tmp_path.write_bytes(content)
+                tmp_path.replace(file_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            stored_name = file_name
+            hashes[content_hash] = stored_name
         
         # Assign a unique ID
         sound_id = 1 if not sounds else max(sound["id"] for sound in sounds) + 1
         sounds.append({
             "id": sound_id,
             "display_name": display_name,
-            "file_name": file.filename
+            "file_name": stored_name
         })
         data["sounds"] = sounds
         save_index_atomic(data)
+        return stored_name
+
+async def add_sound(
+    display_name: str,
+    file: discord.Attachment,
+) -> str:
+    """Add a new sound to the system. Returns the stored file name."""
+    
+    if not ID_RE.match(display_name):
+        raise ValueError("Display Name must be less than 64 characters.")
+    if not file:
+        raise ValueError("File is required.")
+    if file.content_type not in allowed_content_types:
+        raise ValueError("Only audio files are allowed (.mp3, .wav, etc.).")
+
+    # Download before taking the lock, then hash and store off the event loop
+    content = await file.read()
+    return await asyncio.to_thread(_store_upload, display_name, file.filename, content)
 
 def delete_sound(display_name: str) -> bool:
     """Delete a sound by its display name."""
@@ -109,19 +200,71 @@ def delete_sound(display_name: str) -> bool:
         sounds = data.get("sounds", [])
         for sound in sounds:
             if sound["display_name"] == display_name:
-                file_path = base_dir / sound["file_name"]
-                try:
-                    file_path.unlink()
-                except Exception as e:
-                    print(f"Error deleting file {file_path}: {e}")
-                    return False
+                # Only remove the file once no other sound points at it
+                if _file_refs(sounds, sound["file_name"]) == 1:
+                    try:
+                        _unlink_stored_file(data, base_dir, sound["file_name"])
+                    except Exception as e:
+                        print(f"Error deleting file {base_dir / sound['file_name']}: {e}")
+                        return False
 
+                forget_sound(sound["id"])
                 sounds.remove(sound)
                 data["sounds"] = sounds
                 save_index_atomic(data)
                 return True
     return False
 
+def dedupe_sounds() -> Tuple[int, int]:
+    """
+    Hash the files referenced in sounds.json and merge entries whose files are
+    identical. Files in the sounds directory that no entry references are left alone.
+    Returns the number of files removed and the bytes freed.
+    """
+    
+    # Hash outside the lock so adds and deletes are not held up
+    data, base_dir = load_sounds()
+    file_names = {sound["file_name"] for sound in data.get("sounds", [])}
+    signatures = {name: _file_signature(base_dir / name) for name in file_names}
+    file_hashes = _hash_files(base_dir, file_names)
+    
+    with _lock:
+        data, base_dir = load_sounds()
+        sounds = data.get("sounds", [])
+        
+        # Drop hashes of files that were replaced while hashing
+        file_hashes = {
+            name: content_hash for name, content_hash in file_hashes.items()
+            if signatures[name] is not None and _file_signature(base_dir / name) == signatures[name]
+        }
+        hashes: Dict[str, str] = {}
+        removed = freed = 0
+        
+        for sound in sounds:
+            file_name = sound["file_name"]
+            if file_name not in file_hashes:
+                continue
+            keep = hashes.setdefault(file_hashes[file_name], file_name)
+            if keep == file_name:
+                continue
+            
+            # Point this entry at the first copy and drop the duplicate file
+            sound["file_name"] = keep
+            if _file_refs(sounds, file_name) == 0:
+                file_path = base_dir / file_name
+                try:
+                    size = file_path.stat().st_size
+                    _unlink_stored_file(data, base_dir, file_name)
+                    removed += 1
+                    freed += size
+                except Exception as e:
+                    print(f"Error deleting file {file_path}: {e}")
+        
+        data["hashes"] = hashes
+        data["sounds"] = sounds
+        save_index_atomic(data)
+        return removed, freed
+
 def list_sounds(prefix: str, limit: int = 25) -> List[Tuple[str,str]]:
     """List all sounds matching the given prefix."""
     data, _ = load_sounds()
@@ -129,11 +272,125 @@ def list_sounds(prefix: str, limit: int = 25) -> List[Tuple[str,str]]:
     if not sounds:
         return []
     
+    # Most played sounds first
+    counts = play_counts()
+    ranked = sorted(sounds, key=lambda sound: counts.get(str(sound["id"]), 0), reverse=True)
+    
     if not prefix:
-        return sounds[:limit]
+        return ranked[:limit]
     p = prefix.lower()
     
-    filtered = [sound for sound in sounds if sound["display_name"].lower().startswith(p)]
+    filtered = [sound for sound in ranked if sound["display_name"].lower().startswith(p)]
     return filtered[:limit]
 
+class CachedOpusAudio(discord.AudioSource):
+    """Audio source that plays pre-encoded Opus frames from memory."""
+    
+    def __init__(self, frames: List[bytes]):
+        self._frames = iter(frames)
+    
+    def is_opus(self) -> bool:
+        return True
+    
+    def read(self) -> bytes:
+        return next(self._frames, b"")
+
+def get_cached_frames(file_path: Path) -> Optional[List[bytes]]:
+    """Return the cached Opus frames for a sound, or None on a miss."""
+    
+    global _audio_cache_hits, _audio_cache_misses
+    
+    key = str(file_path)
+    with _audio_lock:
+        frames = _audio_cache.get(key)
+        if frames is None:
+            _audio_cache_misses += 1
+            return None
+        _audio_cache.move_to_end(key)
+        _audio_cache_hits += 1
+        return frames
+
+def cache_sound_frames(file_path: Path) -> Optional[List[bytes]]:
+    """
+    Decode a sound into Opus frames with ffmpeg and cache them.
+    Sounds longer than AUDIO_CACHE_MAX_SECONDS are not cached.
+    """
+    
+    global _audio_cache_bytes
+    
+    key = str(file_path)
+    with _audio_lock:
+        if key in _uncacheable:
+            return None
+        if key in _audio_cache:
+            return _audio_cache[key]
+    
+    frames: List[bytes] = []
+    source = None
+    try:
+        source = discord.FFmpegOpusAudio(key)
+        while True:
+            frame = source.read()
+            if not frame:
+                break
+            frames.append(frame)
+            if len(frames) > AUDIO_CACHE_MAX_FRAMES:
+                with _audio_lock:
+                    _uncacheable.add(key)
+                return None
+    except Exception as e:
+        print(f"Error decoding sound file {file_path}: {e}")
+        return None
+    finally:
+        if source is not None:
+            source.cleanup()
+    
+    with _audio_lock:
+        if key not in _audio_cache:
+            _audio_cache[key] = frames
+            _audio_cache_bytes += sum(len(frame) for frame in frames)
+        # Evict least recently used entries
+        while _audio_cache_bytes > AUDIO_CACHE_MAX_BYTES and len(_audio_cache) > 1:
+            _, old = _audio_cache.popitem(last=False)
+            _audio_cache_bytes -= sum(len(frame) for frame in old)
+    return frames
+
+def evict_cached_sound(file_path: Path) -> None:
+    """Remove a sound file from the in-memory cache."""
+    
+    global _audio_cache_bytes
+    
+    with _audio_lock:
+        _uncacheable.discard(str(file_path))
+        frames = _audio_cache.pop(str(file_path), None)
+        if frames is not None:
+            _audio_cache_bytes -= sum(len(frame) for frame in frames)
+
+def audio_cache_stats() -> Dict[str, float]:
+    """Return hit/miss counters and size of the in-memory sound cache."""
+    
+    with _audio_lock:
+        lookups = _audio_cache_hits + _audio_cache_misses
+        return {
+            "hits": _audio_cache_hits,
+            "misses": _audio_cache_misses,
+            "hit_rate": _audio_cache_hits / lookups if lookups else 0.0,
+            "entries": len(_audio_cache),
+            "bytes": _audio_cache_bytes,
+        }
+
+def warm_sound_cache(limit: int = 10) -> int:
+    """Decode the most played sounds into memory. Returns the number loaded."""
+    
+    data, base_dir = load_sounds()
+    by_id = {str(sound["id"]): sound for sound in data.get("sounds", [])}
+    
+    loaded = 0
+    for sound_id, _plays, _last_played in top_sounds(limit):
+        sound = by_id.get(sound_id)
+        file_path = base_dir / sound["file_name"] if sound else None
+        if file_path and file_path.exists() and cache_sound_frames(file_path) is not None:
+            loaded += 1
+    return loaded
+
     
\ No newline at end of file
@@ -0,0 +1,150 @@
+import json
+import time
+import asyncio
+import threading
+from pathlib import Path
+from contextlib import suppress
+from typing import Dict, List, Optional, Set, Tuple
+
+# Define the location of the stats JSON file
+STATS_JSON = Path("./sounds/stats.json")
+
+# How often buffered plays are written to disk (seconds)
+FLUSH_INTERVAL = 60.0
+
+# Lock to ensure thread-safety
+_lock = threading.Lock()
+
+# Persisted stats keyed by sound ID: {"plays": int, "last_played": float}
+_stats: Dict[str, Dict[str, float]] = {}
+_loaded = False
+
+# Plays recorded since the last flush
+_pending: Dict[str, Dict[str, float]] = {}
+
+# Sounds deleted since the last flush
+_forgotten: Set[str] = set()
+
+# Current play count per sound, kept up to date for autocomplete ranking
+_counts: Dict[str, int] = {}
+
+# Background flush task
+_flusher_task: Optional[asyncio.Task] = None
+
+def _load_stats() -> None:
+    """Load persisted stats from disk once. Caller must hold the lock."""
+
+    global _stats, _loaded
+
+    if _loaded:
+        return
+    _loaded = True
+
+    if not STATS_JSON.exists():
+        return
+    try:
+        data = json.loads(STATS_JSON.read_text(encoding="utf-8"))
+        _stats = data.get("sounds", {})
+    except Exception as e:
+        print(f"Error reading stats file: {e}")
+    _counts.update({key: int(entry["plays"]) for key, entry in _stats.items()})
+
+def _merged() -> Dict[str, Dict[str, float]]:
+    """Combine persisted and pending stats. Caller must hold the lock."""
+
+    _load_stats()
+    merged = {key: dict(entry) for key, entry in _stats.items() if key not in _forgotten}
+    for key, entry in _pending.items():
+        current = merged.setdefault(key, {"plays": 0, "last_played": 0.0})
+        current["plays"] += entry["plays"]
+        current["last_played"] = max(current["last_played"], entry["last_played"])
+    return merged
+
+def record_play(sound_id: int) -> None:
+    """Record a play in memory. It is written to disk on the next flush."""
+
+    with _lock:
+        _load_stats()
+        entry = _pending.setdefault(str(sound_id), {"plays": 0, "last_played": 0.0})
+        entry["plays"] += 1
+        entry["last_played"] = time.time()
+        _counts[str(sound_id)] = _counts.get(str(sound_id), 0) + 1
+
+def forget_sound(sound_id: int) -> None:
+    """Drop all stats for a deleted sound."""
+
+    with _lock:
+        # Load first so the persisted count cannot reappear later
+        _load_stats()
+        _pending.pop(str(sound_id), None)
+        _forgotten.add(str(sound_id))
+        _counts.pop(str(sound_id), None)
+
+def flush_stats() -> None:
+    """Write buffered plays to the stats file atomically."""
+
+    global _stats
+
+    with _lock:
+        if not _pending and not _forgotten:
+            return
+        merged = _merged()
+
+        STATS_JSON.parent.mkdir(parents=True, exist_ok=True)
+        tmp = STATS_JSON.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps({"sounds": merged}, indent=2) + "\n", encoding="utf-8")
+            tmp.replace(STATS_JSON)  # atomic on the same filesystem
+        except Exception as e:
+            print(f"Error saving stats file: {e}")
+            return
+        _stats = merged
+        _pending.clear()
+        _forgotten.clear()
+
+def play_counts() -> Dict[str, int]:
+    """Return the play count for every sound that has been played."""
+
+    with _lock:
+        _load_stats()
+        return dict(_counts)
+
+def top_sounds(limit: int = 10) -> List[Tuple[str, int, float]]:
+    """Return (sound ID, plays, last played) for the most played sounds."""
+
+    with _lock:
+        merged = _merged()
+    ranked = sorted(merged.items(), key=lambda item: item[1]["plays"], reverse=True)
+    return [(key, int(entry["plays"]), entry["last_played"]) for key, entry in ranked[:limit]]
+
+async def run_stats_flusher(interval: float = FLUSH_INTERVAL) -> None:
+    """Periodically flush buffered plays until cancelled."""
+
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(flush_stats)
+    finally:
+        flush_stats()
+
+def start_stats_flusher(interval: float = FLUSH_INTERVAL) -> None:
+    """Start the background flush task on the running loop."""
+
+    global _flusher_task
+
+    if _flusher_task is None:
+        _flusher_task = asyncio.get_running_loop().create_task(run_stats_flusher(interval))
+
+async def stop_stats_flusher() -> None:
+    """Cancel the background flush task, flushing any buffered plays."""
+
+    global _flusher_task
+
+    if _flusher_task is not None:
+        _flusher_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await _flusher_task
+        _flusher_task = None
+
+    # The task may be cancelled before it ever ran
+    flush_stats()
@@ -0,0 +1,74 @@
+import asyncio
+from typing import Callable
+from discord import AudioSource, Interaction, VoiceChannel
+from utils.monitor import MonitoredSource
+
+async def play_in_voice(
+    interaction: Interaction,
+    channel: VoiceChannel,
+    make_source: Callable[[], AudioSource],
+    title: str
+) -> bool:
+    """
+    Join a voice channel, play a source to the end and disconnect.
+
+    Args:
+        interaction (Interaction): Deferred interaction used for replies
+        channel (VoiceChannel): Channel to play in
+        make_source (Callable[[], AudioSource]): Builds the source once the
+            bot is free to play
+        title (str): Name shown in the "Playing" reply
+
+    Returns:
+        bool: True if the source was played, False if the bot was busy or
+        playback failed
+    """
+    vc = interaction.guild.voice_client
+
+    # Never take over the voice client while something else is playing
+    if vc and vc.is_connected() and (vc.is_playing() or vc.is_paused()):
+        await interaction.followup.send(
+            "⚠️ I'm already playing something. Try again when it finishes.", ephemeral=True
+        )
+        return False
+
+    # Connect to voice channel
+    connected_here = not (vc and vc.is_connected())
+    try:
+        if connected_here:
+            vc = await channel.connect(timeout=10.0, reconnect=True)
+        else:
+            await vc.move_to(channel)
+    except Exception as e:
+        await interaction.followup.send(f"❌ Failed to join voice channel: {e}", ephemeral=True)
+        return False
+
+    started = False
+    try:
+        source = make_source()
+
+        done = asyncio.Event()
+
+        def after_playing(error: Exception = None):
+            if error:
+                print(f"Error playing {title}: {error}")
+            interaction.client.loop.call_soon_threadsafe(done.set)
+
+        vc.play(MonitoredSource(source), after=after_playing)
+        started = True
+        await interaction.followup.send(f"▶️ Playing **{title}**.", ephemeral=True)
+
+        # Wait for playback to finish
+        await done.wait()
+
+    except Exception as e:
+        await interaction.followup.send(f"❌ Could not play **{title}**: {e}", ephemeral=True)
+
+    # Only disconnect a client this call played on or connected, and never
+    # while another command is playing on it
+    try:
+        if (started or connected_here) and vc.is_connected() and not vc.is_playing():
+            await vc.disconnect()
+    except Exception as e:
+        print(f"Error disconnecting from voice: {e}")
+    return started